@@ -0,0 +1,46 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Each statement is run in a fresh interpreter, so that modules cached by an earlier statement do not hide their import time
+STATEMENTS = {
+    'python': 'pass',
+    'main.cli': 'import main.cli',
+    'main.parse': 'import main.parse',
+    'main.photomosaic': 'import main.photomosaic',
+    'cli --help': 'import sys; sys.argv = ["photomosaic", "--help"]; import main.cli\ntry:\n    main.cli.main()\nexcept SystemExit:\n    pass',
+}
+
+
+def time_statement(statement: str, repeats: int) -> list[float]:
+    """
+    Time how long a fresh interpreter takes to run a statement.
+
+    :param statement: str of the python code to be run
+    :param repeats: int of the number of fresh interpreters to time
+    :return: list of the wall-clock time of each run in seconds
+    """
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], cwd=repo_dir, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark the import time of the photomosaic entry points.')
+    arg_parser.add_argument('--repeats', type=int, default=5, help='Number of fresh interpreters to time for each entry point.')
+    args = arg_parser.parse_args()
+    print(f'{"entry point":<20} {"median (s)":>10} {"min (s)":>10}')
+    for (name, statement) in STATEMENTS.items():
+        timings = time_statement(statement, args.repeats)
+        print(f'{name:<20} {statistics.median(timings):>10.3f} {min(timings):>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import logging
+
+# This module is the console entry point, so it only imports the standard library at module load.
+# The imaging stack is imported once a stage that needs it is reached, which keeps --help and --validate-only fast.
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog='photomosaic', description='Photomosaic generator. For more details, see https://github.com/Edg209/photomosaic.')
+    arg_parser.add_argument('parameters_json_path', help='Path to a JSON file of parameters. For more details, see https://github.com/Edg209/photomosaic/blob/main/overview.md.')
+    arg_parser.add_argument('--frames', nargs='+', help='Paths of a sequence of target images, such as video frames. A photomosaic is generated for each, recalculating only the tiles that changed.')
+    arg_parser.add_argument('--change-threshold', type=float, help='Image distance a tile must exceed compared to the previous frame to be recalculated, 0 by default. Only used with --frames.')
+    arg_parser.add_argument('--pyramid', type=int, metavar='TILE_SIZE', help='Save the final photomosaic as a Deep Zoom pyramid of tiles of this size instead of as png files. Intended for photomosaics too large for a single png file.')
+    arg_parser.add_argument('--preview', action='store_true', help='Save a quick low resolution preview from the mean colour of each image before generating the full photomosaic, and use it to speed up the full photomosaic.')
+    arg_parser.add_argument('--validate-only', action='store_true', help='Check the JSON of parameters and the input files without generating the photomosaic.')
+    return arg_parser
+
+
+def validate(parameters_json_path: str, target_frames: list[str] = None):
+    from main.parse import InputParser
+    input_parser = InputParser(parameters_json_path)
+    input_parser.validate(target_frames)
+
+
+def main(argv: list[str] = None):
+    arg_parser = _build_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if args.pyramid is not None and args.pyramid < 1:
+        arg_parser.error('--pyramid tile size must be a positive integer')
+    if args.frames and args.pyramid is not None:
+        arg_parser.error('--pyramid cannot be used with --frames')
+    if args.frames and args.preview:
+        arg_parser.error('--preview cannot be used with --frames')
+    if not args.frames and args.change_threshold is not None:
+        arg_parser.error('--change-threshold can only be used with --frames')
+    logging.basicConfig(format='%(asctime)s [%(levelname)s] - %(message)s', level=logging.INFO)
+    if args.validate_only:
+        validate(args.parameters_json_path, args.frames)
+        logging.info('Validation successful')
+        return
+    from main.photomosaic import main as photomosaic_main
+    photomosaic_main(args.parameters_json_path, args.frames, args.change_threshold or 0.0, args.pyramid, args.preview)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,3 +8,7 @@ class InvalidTypeException(PhotomosaicException, TypeError):
 
 class InvalidShapeException(PhotomosaicException, ValueError):
     pass
+
+
+class InvalidImageException(PhotomosaicException, ValueError):
+    pass
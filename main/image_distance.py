@@ -33,6 +33,28 @@ def image_distance(img1: np.ndarray, img2: np.ndarray) -> float:
     return np.average(img_distances)
 
 
+def mean_colour_distance_grid(candidate_image: np.ndarray, target_means: np.ndarray) -> np.ndarray:
+    """
+    Calculate the mean colour distance of a candidate image to each of a grid of target images.
+    The mean colour distance is the image distance between the mean colour of each image, treating each as a single pixel.
+
+    For each of R, G and B, the average of the absolute differences of two images is at least the absolute difference of their averages.
+    The mean colour distance is therefore never more than the image distance, so it can be used as a fast approximation and as a lower bound of the image distance.
+
+    The mean colours of the target images do not depend on the candidate image, so they are passed in to be calculated only once for every candidate image.
+
+    :param candidate_image: numpy.ndarray of shape (X,Y,3) of the RGB values of the candidate image
+    :param target_means: numpy.ndarray of shape (A,B,3) where (A,B) is the grid shape, giving the mean RGB values of each target image, e.g. numpy.mean(target_images, axis=(2, 3))
+    :return: numpy.ndarray of floats of shape (A,B) of the mean colour distances. Each is in the range [0,255].
+    """
+    if len(candidate_image.shape) != 3 or len(target_means.shape) != 3:
+        raise InvalidShapeException
+    if candidate_image.shape[2] != target_means.shape[2]:
+        raise InvalidShapeException
+    candidate_mean = np.mean(candidate_image, axis=(0, 1))
+    return np.average(np.abs(target_means - candidate_mean), axis=2)
+
+
 class CandidateImageDistanceGrid(object):
     """
     An object that represents the image distance of a comparison candidate image to a grid of comparison target images.
@@ -44,6 +66,8 @@ class CandidateImageDistanceGrid(object):
 
     Methods:
         calculate: Populate distance_grid with image distances
+        update: Recalculate distance_grid at selected locations for a new grid of comparison target images
+        calculate_pruned: Populate distance_grid with image distances, skipping the locations where a lower bound shows the candidate cannot be optimal
         output_to_csv: Save the values of distance_grid to a csv file
     """
 
@@ -85,5 +109,41 @@ class CandidateImageDistanceGrid(object):
         distances = [[image_distance(self._candidate_image, cell) for cell in row] for row in self._target_images]
         self.distance_grid = np.array(distances)
 
+    def calculate_pruned(self, lower_bounds: np.ndarray, thresholds: np.ndarray) -> int:
+        """
+        Populate distance_grid with image distances, only calculating them at the locations where the lower bound is not above the threshold.
+        Every other location is left as numpy.nan, as the candidate image cannot be optimal there. As numpy.nan is never less than a distance, it is never chosen by an OutputLayout.
+
+        :param lower_bounds: a numpy.ndarray of floats of the grid shape, each no more than the image distance at that location
+        :param thresholds: a numpy.ndarray of floats of the grid shape, each no less than the image distance of the optimal image at that location
+        :return: int of the number of image distances that were calculated
+        """
+        if lower_bounds.shape != self.grid_shape or thresholds.shape != self.grid_shape:
+            raise InvalidShapeException
+        # A small tolerance is allowed so that floating point error cannot prune a candidate that equals the threshold
+        calculate_mask = lower_bounds <= thresholds + 1e-6
+        self.distance_grid = np.full(self.grid_shape, np.nan)
+        for x, y in zip(*np.nonzero(calculate_mask)):
+            self.distance_grid[x, y] = image_distance(self._candidate_image, self._target_images[x, y])
+        return int(np.count_nonzero(calculate_mask))
+
+    def update(self, target_images: np.ndarray, changed_mask: np.ndarray):
+        """
+        Replace the comparison target images and recalculate the image distances only where the targets have changed.
+
+        :param target_images: a numpy.ndarray of the same shape and dtype as the target images used to construct this object
+        :param changed_mask: a numpy.ndarray of booleans of the grid shape, True at each location to be recalculated
+        """
+        if target_images.shape != self._target_images.shape or changed_mask.shape != self.grid_shape:
+            raise InvalidShapeException
+        if target_images.dtype != np.uint8:
+            raise InvalidTypeException
+        self._target_images = target_images
+        if self.distance_grid is None:
+            self.calculate()
+            return
+        for x, y in zip(*np.nonzero(changed_mask)):
+            self.distance_grid[x, y] = image_distance(self._candidate_image, target_images[x, y])
+
     def output_to_csv(self, filepath: str):
         np.savetxt(filepath, self.distance_grid, delimiter=',')
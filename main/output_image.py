@@ -3,6 +3,8 @@ import os
 import numpy as np
 import skimage.io as si
 
+from main.exceptions import InvalidShapeException
+
 
 class OutputImage(object):
     """
@@ -15,6 +17,7 @@ class OutputImage(object):
 
     Methods:
         assemble: Populate assembled_image with the RGB values of the assembled image
+        update: Replace the image grid and patch assembled_image only where the chosen images have changed
         output_to_png: Save the values of assembled_image as a png file
     """
 
@@ -27,11 +30,35 @@ class OutputImage(object):
         """
         self.grid_shape = image_grid.shape
         self.candidate_images = {image_name: si.imread(os.path.join(image_directory, image_name)) for image_name in np.unique(image_grid)}
+        self._image_directory = image_directory
         self._image_grid = image_grid
         self.assembled_image = None
 
     def assemble(self):
         self.assembled_image = np.vstack([np.hstack([self.candidate_images[cell] for cell in row]) for row in self._image_grid])
 
+    def update(self, image_grid: np.ndarray) -> int:
+        """
+        Replace the grid of chosen images, and patch the assembled image only at the locations where the chosen image has changed.
+
+        :param image_grid: numpy.nparray of the names of the images to be used at each point in the grid. Must have the same shape as the current grid.
+        :return: int of the number of locations of the assembled image that were patched
+        """
+        if image_grid.shape != self.grid_shape:
+            raise InvalidShapeException
+        changed_locations = list(zip(*np.nonzero(image_grid != self._image_grid)))
+        self._image_grid = image_grid.copy()
+        if self.assembled_image is None:
+            self.assemble()
+            return len(changed_locations)
+        for x, y in changed_locations:
+            image_name = image_grid[x, y]
+            if image_name not in self.candidate_images:
+                self.candidate_images[image_name] = si.imread(os.path.join(self._image_directory, image_name))
+            candidate_image = self.candidate_images[image_name]
+            tile_x, tile_y = candidate_image.shape[:2]
+            self.assembled_image[x * tile_x:(x + 1) * tile_x, y * tile_y:(y + 1) * tile_y] = candidate_image
+        return len(changed_locations)
+
     def output_to_png(self, filepath: str):
         si.imsave(filepath, self.assembled_image)
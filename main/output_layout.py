@@ -15,6 +15,7 @@ class OutputLayout(object):
 
     Methods:
         calculate: Populate image_grid with the optimal image names
+        update: Replace the image distances and recalculate image_grid at selected locations
         output_to_csv: Save the values of image_grid to a csv file
     """
 
@@ -50,5 +51,35 @@ class OutputLayout(object):
         self.candidate_images = np.unique(best_candidates)
         logging.info('Optimal distance grid calculated')
 
+    def update(self, image_distances: dict[str, np.ndarray], changed_mask: np.ndarray):
+        """
+        Replace the image distances, and recalculate the optimal images only at the locations where the image distances have changed.
+
+        :param image_distances: a dict of the same form as the one used to construct this object, with the updated image distances
+        :param changed_mask: a numpy.ndarray of booleans of the grid shape, True at each location to be recalculated
+        """
+        if changed_mask.shape != self.grid_shape:
+            raise InvalidShapeException
+        for arr in image_distances.values():
+            if arr.shape != self.grid_shape:
+                raise InvalidShapeException
+        self._image_distances = image_distances
+        if self.image_grid is None:
+            self.calculate()
+            return
+        logging.info(f'Recalculating optimal distance grid at {np.count_nonzero(changed_mask)} locations')
+        # This is the same loop as in calculate, restricted to the locations in the mask
+        best_candidates = np.full(np.count_nonzero(changed_mask), '', dtype=self.image_grid.dtype)
+        best_distances = np.full(np.count_nonzero(changed_mask), 1000, dtype=float)
+        for (candidate, distances) in self._image_distances.items():
+            masked_distances = distances[changed_mask]
+            improvement_mask = masked_distances < best_distances
+            best_candidates = np.where(improvement_mask, candidate, best_candidates)
+            best_distances = np.where(improvement_mask, masked_distances, best_distances)
+        # The candidate names may be longer than any name currently in the grid, so we widen its dtype if needed
+        self.image_grid = self.image_grid.astype(np.result_type(self.image_grid, best_candidates))
+        self.image_grid[changed_mask] = best_candidates
+        self.candidate_images = np.unique(self.image_grid)
+
     def output_to_csv(self, filepath: str):
-        np.savetxt(filepath, self.image_grid, delimiter=',')
+        np.savetxt(filepath, self.image_grid, delimiter=',', fmt='%s')
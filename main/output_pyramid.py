@@ -0,0 +1,139 @@
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import skimage.io as si
+import skimage.transform as st
+import skimage.util as su
+from main.exceptions import InvalidShapeException
+
+
+def _ceil_div(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
+
+
+class OutputPyramid(object):
+    """
+    An object that represents an image composed of several candidate images arranged in a grid, stored as a Deep Zoom pyramid of tiles.
+
+    The full-size image is never assembled. Each tile of each level is assembled directly from the candidate images, resized to the size each candidate occupies at that level,
+    so the memory needed is independent of the size of the full image.
+
+    Level 0 is a single pixel, and each level is twice the size of the level before it, up to the last level which is the full-size image.
+    At each level, the boundary of the i-th row of the grid is at ceil(i * X / 2^k) where X is the number of rows of each candidate image and k is the number of levels below full-size.
+
+    Attributes:
+        grid_shape: A tuple giving the x,y size of the grid of images.
+        output_shape: A tuple giving the x,y size of each of the candidate images.
+        full_shape: A tuple giving the x,y size of the full-size image.
+        tile_size: An int giving the x and y size of each tile of the pyramid.
+        levels: An int giving the number of levels of the pyramid.
+        candidate_images: A dict that maps the name a candidate image to a numpy.ndarray of the RGB values of that image.
+
+    Methods:
+        level_shape: Give the x,y size of the image at a level
+        assemble_tile: Give the RGB values of a tile of a level
+        output_to_deep_zoom: Save every tile of the pyramid as png files, with a Deep Zoom descriptor
+    """
+
+    def __init__(self, image_grid: np.ndarray, candidate_images: dict[str, np.ndarray], tile_size: int = 256):
+        """
+        Construct an OutputPyramid of the chosen optimal images at each location on the grid.
+
+        :param image_grid: numpy.nparray of the names of the images to be used at each point in the grid.
+        :param candidate_images: a dict that maps the name of each image in the image grid to a numpy.ndarray of the RGB values of that image. Every image must have the same shape.
+        :param tile_size: int of the x and y size of each tile of the pyramid
+        """
+        if tile_size < 1:
+            raise InvalidShapeException
+        self.grid_shape = image_grid.shape
+        self.candidate_images = {image_name: candidate_images[image_name] for image_name in np.unique(image_grid)}
+        candidate_shapes = {image.shape for image in self.candidate_images.values()}
+        if len(candidate_shapes) != 1:
+            raise InvalidShapeException
+        self._candidate_shape = candidate_shapes.pop()
+        self.output_shape = self._candidate_shape[:2]
+        self.full_shape = (self.grid_shape[0] * self.output_shape[0], self.grid_shape[1] * self.output_shape[1])
+        self.tile_size = tile_size
+        self.levels = (max(self.full_shape) - 1).bit_length() + 1
+        self._image_grid = image_grid
+        self._thumbnails = {}
+
+    def level_shape(self, level: int) -> tuple[int, int]:
+        scale = 2 ** (self.levels - 1 - level)
+        return _ceil_div(self.full_shape[0], scale), _ceil_div(self.full_shape[1], scale)
+
+    def assemble_tile(self, level: int, tile_x: int, tile_y: int) -> np.ndarray:
+        """
+        Assemble a single tile of a level of the pyramid from the candidate images.
+
+        :param level: int of the level of the pyramid, 0 is the smallest level
+        :param tile_x: int of the row of the tile within the level
+        :param tile_y: int of the column of the tile within the level
+        :return: numpy.ndarray of the RGB values of the tile. Tiles on the bottom and right edges of a level may be smaller than tile_size.
+        """
+        scale = 2 ** (self.levels - 1 - level)
+        level_shape = self.level_shape(level)
+        tile_start = (tile_x * self.tile_size, tile_y * self.tile_size)
+        tile_end = (min(tile_start[0] + self.tile_size, level_shape[0]), min(tile_start[1] + self.tile_size, level_shape[1]))
+        tile = np.zeros((tile_end[0] - tile_start[0], tile_end[1] - tile_start[1]) + self._candidate_shape[2:], dtype=np.uint8)
+        # Only the cells of the grid that can overlap the tile are considered, with a margin of one cell for the rounding of the boundaries
+        grid_ranges = [range(max(0, (tile_start[axis] * scale) // self.output_shape[axis] - 1), min(self.grid_shape[axis], (tile_end[axis] * scale) // self.output_shape[axis] + 1))
+                       for axis in (0, 1)]
+        for x in grid_ranges[0]:
+            cell_x = (_ceil_div(x * self.output_shape[0], scale), _ceil_div((x + 1) * self.output_shape[0], scale))
+            overlap_x = (max(cell_x[0], tile_start[0]), min(cell_x[1], tile_end[0]))
+            if overlap_x[0] >= overlap_x[1]:
+                continue
+            for y in grid_ranges[1]:
+                cell_y = (_ceil_div(y * self.output_shape[1], scale), _ceil_div((y + 1) * self.output_shape[1], scale))
+                overlap_y = (max(cell_y[0], tile_start[1]), min(cell_y[1], tile_end[1]))
+                if overlap_y[0] >= overlap_y[1]:
+                    continue
+                thumbnail = self._thumbnail(self._image_grid[x, y], (cell_x[1] - cell_x[0], cell_y[1] - cell_y[0]))
+                tile[overlap_x[0] - tile_start[0]:overlap_x[1] - tile_start[0], overlap_y[0] - tile_start[1]:overlap_y[1] - tile_start[1]] = \
+                    thumbnail[overlap_x[0] - cell_x[0]:overlap_x[1] - cell_x[0], overlap_y[0] - cell_y[0]:overlap_y[1] - cell_y[0]]
+        return tile
+
+    def output_to_deep_zoom(self, folderpath: str, max_workers: int = None):
+        """
+        Save every tile of the pyramid in the Deep Zoom layout.
+
+        The descriptor is saved as mosaic.dzi, and each tile is saved as mosaic_files/<level>/<column>_<row>.png.
+        The tiles are assembled and saved by a pool of threads, and each tile is saved as soon as it is assembled.
+
+        :param folderpath: str of the path of the folder to be created to contain the pyramid
+        :param max_workers: int of the number of threads used to assemble and save tiles. If None, the default of concurrent.futures.ThreadPoolExecutor is used.
+        """
+        os.mkdir(folderpath)
+        with open(os.path.join(folderpath, 'mosaic.dzi'), 'w') as opened_dzi:
+            opened_dzi.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                             f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="png" Overlap="0" TileSize="{self.tile_size}">'
+                             f'<Size Height="{self.full_shape[0]}" Width="{self.full_shape[1]}"/></Image>\n')
+        tiles_folderpath = os.path.join(folderpath, 'mosaic_files')
+        os.mkdir(tiles_folderpath)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for level in range(self.levels):
+                level_shape = self.level_shape(level)
+                tile_grid_shape = (_ceil_div(level_shape[0], self.tile_size), _ceil_div(level_shape[1], self.tile_size))
+                logging.info(f'Saving level {level} of {self.levels - 1}, {tile_grid_shape[0] * tile_grid_shape[1]} tiles')
+                os.mkdir(os.path.join(tiles_folderpath, str(level)))
+                # The results are consumed so that any exception raised in a thread is raised here
+                list(executor.map(functools.partial(self._output_tile, tiles_folderpath, level), np.ndindex(tile_grid_shape)))
+                # The thumbnails of one level are not reused by the next level, so they are released
+                self._thumbnails = {}
+
+    def _output_tile(self, tiles_folderpath: str, level: int, tile_position: tuple[int, int]):
+        tile_x, tile_y = tile_position
+        tile = self.assemble_tile(level, tile_x, tile_y)
+        si.imsave(os.path.join(tiles_folderpath, str(level), f'{tile_y}_{tile_x}.png'), tile, check_contrast=False)
+
+    def _thumbnail(self, image_name: str, shape: tuple[int, int]) -> np.ndarray:
+        if shape == self.output_shape:
+            return self.candidate_images[image_name]
+        # Several threads may resize the same thumbnail at once, which is wasteful but harmless as they produce the same result
+        if (image_name, shape) not in self._thumbnails:
+            self._thumbnails[(image_name, shape)] = su.img_as_ubyte(st.resize(self.candidate_images[image_name], shape, anti_aliasing=True))
+        return self._thumbnails[(image_name, shape)]
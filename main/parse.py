@@ -5,10 +5,15 @@ import shutil
 
 import numpy as np
 
-from main.exceptions import InvalidShapeException
-import skimage.io as si
-import skimage.transform as st
-import skimage.util as su
+from main.exceptions import InvalidShapeException, InvalidImageException
+
+# The first bytes of every PNG file, used to check the input images without loading them
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _is_png(image_path):
+    with open(image_path, 'rb') as opened_image:
+        return opened_image.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE
 
 
 def _read_json(parameters_json_path):
@@ -34,7 +39,9 @@ class InputParser(object):
         target_image_grid: A numpy.ndarray of shape (A,B,X,Y,3) where (A,B) is the grid shape and (X,Y) is the comparison shape
 
     Methods:
+        validate: Check that the target image and candidate images are PNG files without loading them
         parse: Generate the folder structure and populate the candidate and output image folders
+        slice_target_image: Partition a target image into the grid of comparison target images
     """
 
     def __init__(self, parameters_json: str):
@@ -74,6 +81,28 @@ class InputParser(object):
         self.target_image_grid = np.zeros(self.grid_shape + self.comparison_shape + (3,), dtype=np.uint8)
         logging.info('Input tests successful')
 
+    def validate(self, target_frames: list[str] = None):
+        """
+        Check that the target image and candidate images are PNG files, without loading them.
+
+        :param target_frames: An optional list of the paths of further target images, such as the frames of a sequence, that must also exist and be PNG files
+        """
+        logging.info('Checking input images')
+        if not _is_png(self.target_image):
+            raise InvalidImageException
+        for target_frame in target_frames or []:
+            if not os.path.isfile(target_frame):
+                raise FileNotFoundError
+            if not _is_png(target_frame):
+                raise InvalidImageException
+        candidate_image_names = [image_name for image_name in os.listdir(self.candidate_image_folder) if image_name.lower().endswith('.png')]
+        if not candidate_image_names:
+            raise FileNotFoundError
+        for candidate_image_name in candidate_image_names:
+            if not _is_png(os.path.join(self.candidate_image_folder, candidate_image_name)):
+                raise InvalidImageException
+        logging.info(f'Input images correct, {len(candidate_image_names)} candidate images found')
+
     def parse(self):
         self._create_directories()
         self._resize_images()
@@ -90,10 +119,30 @@ class InputParser(object):
         shutil.copyfile(self.target_image, os.path.join(self.photomosaic_folder, 'target_image.png'))
         logging.info('Working director structure successfully created')
 
+    def slice_target_image(self, original_target_image: np.ndarray) -> np.ndarray:
+        """
+        Partition a target image into the grid of comparison target images.
+
+        :param original_target_image: numpy.ndarray of the RGB values of the full target image
+        :return: numpy.ndarray of shape (A,B,X,Y,3) where (A,B) is the grid shape and (X,Y) is the comparison shape
+        """
+        original_shape = original_target_image.shape[:2]
+        target_image_grid = np.zeros(self.grid_shape + self.comparison_shape + (3,), dtype=np.uint8)
+        for x, y in np.ndindex(self.grid_shape):
+            image_curr_x = int((x * original_shape[0]) / self.grid_shape[0])
+            image_curr_y = int((y * original_shape[1]) / self.grid_shape[1])
+            image_next_x = int(((x + 1) * original_shape[0]) / self.grid_shape[0])
+            image_next_y = int(((y + 1) * original_shape[1]) / self.grid_shape[1])
+            target_image_grid[x, y] = original_target_image[image_curr_x:image_next_x, image_curr_y:image_next_y]
+        return target_image_grid
+
     def _resize_images(self):
+        # The imaging stack is slow to import, so it is only imported once the images are needed
+        import skimage.io as si
+        import skimage.transform as st
+        import skimage.util as su
         logging.info('Resizing images')
         original_target_image = si.imread(self.target_image)
-        original_shape = original_target_image.shape[:2]
         candidate_image_names = {image_name for image_name in os.listdir(self.candidate_image_folder) if image_name.lower().endswith('.png')}
         # For each candidate image, it is resized and saved twice - once as a comparison image and once as an output image
         for candidate_image_name in candidate_image_names:
@@ -105,14 +154,9 @@ class InputParser(object):
             si.imsave(os.path.join(self.photomosaic_folder, 'comparison_candidate_images', candidate_image_name), comparison_image)
             si.imsave(os.path.join(self.photomosaic_folder, 'output_candidate_images', candidate_image_name), output_image)
         # For each location on the grid, we generate the comparison target image for that grid
+        self.target_image_grid = self.slice_target_image(original_target_image)
         for x, y in np.ndindex(self.grid_shape):
-            logging.info(f'Resizing target image {(x, y)}')
-            image_curr_x = int((x * original_shape[0]) / self.grid_shape[0])
-            image_curr_y = int((y * original_shape[1]) / self.grid_shape[1])
-            image_next_x = int(((x + 1) * original_shape[0]) / self.grid_shape[0])
-            image_next_y = int(((y + 1) * original_shape[1]) / self.grid_shape[1])
-            target_image_slice = original_target_image[image_curr_x:image_next_x, image_curr_y:image_next_y]
+            logging.info(f'Saving target image {(x, y)}')
             image_slice_name = str(x) + 'x' + str(y) + '.png'
-            si.imsave(os.path.join(self.photomosaic_folder, 'comparison_target_images', image_slice_name), target_image_slice)
-            self.target_image_grid[x, y] = target_image_slice
+            si.imsave(os.path.join(self.photomosaic_folder, 'comparison_target_images', image_slice_name), self.target_image_grid[x, y])
         logging.info('Images resized successfully')
@@ -1,16 +1,17 @@
-import argparse
+import logging
 import os
-
-from parse import InputParser
-from image_distance import CandidateImageDistanceGrid
-from output_layout import OutputLayout
-from output_image import OutputImage
+import time
 
 import skimage.io as si
 
-import logging
-
-logging.basicConfig(format='%(asctime)s [%(levelname)s] - %(message)s', level=logging.INFO)
+from main.exceptions import InvalidShapeException
+from main.image_distance import CandidateImageDistanceGrid
+from main.output_image import OutputImage
+from main.output_layout import OutputLayout
+from main.output_pyramid import OutputPyramid
+from main.parse import InputParser
+from main.preview import PhotomosaicPreview
+from main.sequence import PhotomosaicSequence
 
 
 class Photomosaic(object):
@@ -27,20 +28,34 @@ class Photomosaic(object):
         image_distance_grids: A dict that takes as key the name of a comparison candidate image and as values a CandidateImageDistanceGrid of that candidate image
         output_layouts: A dict that takes as key the name of a comparison candidate image and as values an OutputLayout of the optimal outputs as of that candidate image being processed
         output_images: A dict that takes as key the name of a comparison candidate image and as values an OutputImage of the optimal main as of that candidate image being processed
+        pyramid_tile_size: If not None, an int giving the tile size of a Deep Zoom pyramid that the final photomosaic is saved as, instead of saving an output image at each iteration
+        output_pyramid: An OutputPyramid of the final photomosaic, if pyramid_tile_size is not None
+        generate_preview: A bool of whether a preview is generated before the full photomosaic
+        preview: If not None, a PhotomosaicPreview calculated before the full photomosaic, whose distances are used to skip image distance calculations that cannot change the output. The output layout and output image are then only saved for the last candidate image.
+        timings: A dict that takes as key the name of a stage of the generation and as values the time in seconds that stage took
 
     Methods:
         generate: Populate each of the attributes and generate the main
     """
 
-    def __init__(self, parameters_json_path: str):
+    def __init__(self, parameters_json_path: str, pyramid_tile_size: int = None, preview: bool = False):
         """
         Create a main object.
 
         For more details, see https://github.com/Edg209/photomosaic.
 
         :param parameters_json_path: Path to the JSON file containing the parameters. For more details see https://github.com/Edg209/photomosaic/blob/main/overview.md.
+        :param pyramid_tile_size: If given, the final photomosaic is saved as a Deep Zoom pyramid with tiles of this size, for mosaics too large to be saved as a single png file.
+        :param preview: If True, a low resolution preview is saved before the full photomosaic is generated, and is used to speed up the full photomosaic.
         """
+        if pyramid_tile_size is not None and pyramid_tile_size < 1:
+            raise InvalidShapeException
         self.parameters_json_path = parameters_json_path
+        self.pyramid_tile_size = pyramid_tile_size
+        self.output_pyramid = None
+        self.generate_preview = preview
+        self.preview = None
+        self.timings = {}
         self.input_parser = None
         self.photomosaic_folder = None
         self.comparison_candidate_images = None
@@ -64,32 +79,81 @@ class Photomosaic(object):
         self.comparison_candidate_images = {imgname: si.imread(os.path.join(comparison_candidate_images_folder, imgname)) for imgname in os.listdir(comparison_candidate_images_folder)}
         self.comparison_target_images = {imgname: si.imread(os.path.join(comparison_target_images_folder, imgname)) for imgname in os.listdir(comparison_target_images_folder)}
         self.output_candidate_images = {imgname: si.imread(os.path.join(output_candidate_images_folder, imgname)) for imgname in os.listdir(output_candidate_images_folder)}
+        if self.generate_preview:
+            self._generate_preview()
+        calculated_distances = 0
+        self.timings['distances'] = 0.0
+        full_start = time.perf_counter()
         # We iterate over each of the candidate images to update our main based on that image
         logging.info(f'Starting loop over candidate images, f{len(self.comparison_target_images)} items to loop over')
+        last_imgname = sorted(self.comparison_candidate_images.keys())[-1]
         for imgname in sorted(self.comparison_candidate_images.keys()):
             logging.info(f'[{imgname}] Starting iteration')
             # We calculate the image distance grid for that candidate image, update the output layout, and generate an output image
             logging.info(f'[{imgname}] Calculating image distance grid')
             self.image_distance_grids[imgname] = CandidateImageDistanceGrid(self.comparison_candidate_images[imgname], self.input_parser.target_image_grid)
-            self.image_distance_grids[imgname].calculate()
+            distance_start = time.perf_counter()
+            if self.preview is None:
+                self.image_distance_grids[imgname].calculate()
+                calculated_distances += self.image_distance_grids[imgname].distance_grid.size
+            else:
+                calculated_distances += self.image_distance_grids[imgname].calculate_pruned(self.preview.lower_bound_grids[imgname], self.preview.best_distances)
+            self.timings['distances'] += time.perf_counter() - distance_start
             self.image_distance_grids[imgname].output_to_csv(os.path.join(self.photomosaic_folder, 'image_distances', imgname + '.csv'))
+            # With a preview, the skipped image distances are not known, so the output layout is only optimal once every candidate image has been processed
+            if self.preview is not None and imgname != last_imgname:
+                continue
             logging.info(f'[{imgname}] Calculating optimal output layout')
-            self.output_layouts[imgname] = OutputLayout(self.image_distance_grids)
+            self.output_layouts[imgname] = OutputLayout({name: grid.distance_grid for (name, grid) in self.image_distance_grids.items()})
             self.output_layouts[imgname].calculate()
             self.output_layouts[imgname].output_to_csv(os.path.join(self.photomosaic_folder, 'output_layouts', imgname + '.csv'))
+            if self.pyramid_tile_size is not None:
+                continue
             logging.info(f'[{imgname}] Generating output image')
             self.output_images[imgname] = OutputImage(self.output_layouts[imgname].image_grid, os.path.join(self.photomosaic_folder, 'output_candidate_images'))
             self.output_images[imgname].assemble()
             self.output_images[imgname].output_to_png(os.path.join(self.photomosaic_folder, 'output_images', imgname))
-
-
-def main(parameters_json_path: str):
-    photomosaic = Photomosaic(parameters_json_path)
-    photomosaic.generate()
+        self.timings['full'] = time.perf_counter() - full_start
+        self._log_timings(calculated_distances)
+        if self.pyramid_tile_size is not None:
+            logging.info('Generating output pyramid')
+            final_layout = self.output_layouts[sorted(self.output_layouts.keys())[-1]]
+            self.output_pyramid = OutputPyramid(final_layout.image_grid, self.output_candidate_images, self.pyramid_tile_size)
+            self.output_pyramid.output_to_deep_zoom(os.path.join(self.photomosaic_folder, 'output_pyramid'))
+
+    def _generate_preview(self):
+        logging.info('Generating preview')
+        preview_start = time.perf_counter()
+        self.preview = PhotomosaicPreview(self.comparison_candidate_images, self.input_parser.target_image_grid)
+        self.preview.calculate()
+        preview_folder = os.path.join(self.photomosaic_folder, 'preview')
+        os.mkdir(preview_folder)
+        self.preview.output_layout.output_to_csv(os.path.join(preview_folder, 'preview_layout.csv'))
+        # The preview image is assembled from the comparison candidate images, so it is the size of the grid of comparison images
+        preview_image = OutputImage(self.preview.output_layout.image_grid, os.path.join(self.photomosaic_folder, 'comparison_candidate_images'))
+        preview_image.assemble()
+        preview_image.output_to_png(os.path.join(preview_folder, 'preview.png'))
+        self.timings['preview'] = time.perf_counter() - preview_start
+        logging.info(f'Preview generated in {self.timings["preview"]:.2f} seconds')
+
+    def _log_timings(self, calculated_distances: int):
+        total_distances = len(self.image_distance_grids) * self.input_parser.grid_shape[0] * self.input_parser.grid_shape[1]
+        logging.info(f'Full photomosaic generated in {self.timings["full"]:.2f} seconds, {calculated_distances} of {total_distances} image distances calculated in {self.timings["distances"]:.2f} seconds')
+        if self.preview is not None and calculated_distances > 0:
+            # We estimate the time the image distances skipped would have taken from the average time of the image distances calculated
+            self.timings['skipped_distances'] = self.timings['distances'] * (total_distances - calculated_distances) / calculated_distances
+            logging.info(f'Preview took {self.timings["preview"]:.2f} seconds, and skipped {total_distances - calculated_distances} image distances estimated to take {self.timings["skipped_distances"]:.2f} seconds')
+
+
+def main(parameters_json_path: str, target_frames: list[str] = None, change_threshold: float = 0.0, pyramid_tile_size: int = None, preview: bool = False):
+    if target_frames:
+        photomosaic_sequence = PhotomosaicSequence(parameters_json_path, target_frames, change_threshold)
+        photomosaic_sequence.generate()
+    else:
+        photomosaic = Photomosaic(parameters_json_path, pyramid_tile_size, preview)
+        photomosaic.generate()
 
 
 if __name__ == '__main__':
-    arg_parser = argparse.ArgumentParser(description='Photomosaic generator. For more details, see https://github.com/Edg209/photomosaic.')
-    arg_parser.add_argument('parameters_json_path', help='Path to a JSON file of parameters. For more details, see https://github.com/Edg209/photomosaic/blob/main/overview.md.')
-    args = arg_parser.parse_args()
-    main(args.parameters_json_path)
+    from main.cli import main as cli_main
+    cli_main()
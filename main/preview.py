@@ -0,0 +1,56 @@
+import logging
+
+import numpy as np
+from main.exceptions import InvalidShapeException
+from main.image_distance import image_distance, mean_colour_distance_grid
+from main.output_layout import OutputLayout
+
+
+class PhotomosaicPreview(object):
+    """
+    An object that represents an approximate photomosaic, calculated from the mean colour of each comparison image only.
+
+    The preview is used both to check the composition quickly, and to prune the full calculation.
+    The mean colour distance of each candidate is a lower bound of its image distance, and the image distance of the candidate chosen by the preview is an upper bound of the optimal image distance.
+    Any candidate whose lower bound is above that upper bound at a location can therefore be skipped at that location without changing the final output layout.
+
+    Attributes:
+        grid_shape: A tuple giving the x,y size of the grid of images
+        lower_bound_grids: A dict that takes as key the name of a comparison candidate image and as values a numpy.ndarray of the mean colour distance of that candidate at each location of the grid
+        output_layout: An OutputLayout of the optimal images according to the mean colour distances
+        best_distances: A numpy.ndarray of floats giving the image distance of the image chosen by the preview at each location of the grid
+
+    Methods:
+        calculate: Populate each of the attributes
+    """
+
+    def __init__(self, comparison_candidate_images: dict[str, np.ndarray], target_images: np.ndarray):
+        """
+        Construct a PhotomosaicPreview of a set of comparison candidate images and a grid of comparison target images.
+
+        :param comparison_candidate_images: a dict where each key is the name of a candidate image and each value is a numpy.ndarray of shape (X,Y,3) of that comparison candidate image
+        :param target_images: a numpy.ndarray of shape (A,B,X,Y,3) where (A,B) is the grid shape and (X,Y) is the comparison shape
+        """
+        if len(target_images.shape) != 5:
+            raise InvalidShapeException
+        self.grid_shape = target_images.shape[:2]
+        self._comparison_candidate_images = comparison_candidate_images
+        self._target_images = target_images
+        self.lower_bound_grids = {}
+        self.output_layout = None
+        self.best_distances = None
+
+    def calculate(self):
+        logging.info('Calculating mean colour distances')
+        target_means = np.mean(self._target_images, axis=(2, 3))
+        for imgname in sorted(self._comparison_candidate_images.keys()):
+            if self._comparison_candidate_images[imgname].shape != self._target_images.shape[2:]:
+                raise InvalidShapeException
+            self.lower_bound_grids[imgname] = mean_colour_distance_grid(self._comparison_candidate_images[imgname], target_means)
+        self.output_layout = OutputLayout(self.lower_bound_grids)
+        self.output_layout.calculate()
+        logging.info('Calculating image distances of the preview layout')
+        self.best_distances = np.zeros(self.grid_shape, dtype=float)
+        for x, y in np.ndindex(self.grid_shape):
+            self.best_distances[x, y] = image_distance(self._comparison_candidate_images[self.output_layout.image_grid[x, y]], self._target_images[x, y])
+        logging.info('Preview calculated')
@@ -0,0 +1,111 @@
+import csv
+import logging
+import os
+
+import numpy as np
+import skimage.io as si
+
+from main.image_distance import image_distance, CandidateImageDistanceGrid
+from main.output_image import OutputImage
+from main.output_layout import OutputLayout
+from main.parse import InputParser
+
+
+class PhotomosaicSequence(object):
+    """
+    An object that represents a sequence of photomosaics generated for a sequence of target images, such as the frames of a video.
+
+    The first frame is generated in full. For each later frame, the comparison target images are compared tile by tile against the targets that were last used for each tile,
+    and the image distances, output layout and output image are only recalculated at the tiles whose image distance to those targets is above a threshold.
+
+    Attributes:
+        parameters_json_path: A string that gives the path to the JSON file containing the parameters of the photomosaic
+        target_frames: A list of the paths of each of the target images in the sequence, in order
+        change_threshold: A float giving the image distance a tile must exceed to be recalculated. Is in the range [0,255].
+        input_parser: A main.parse.InputParser generated by the JSON of parameters
+        photomosaic_folder: The working folder that will be used for the generation of the photomosaics
+        image_distance_grids: A dict that takes as key the name of a comparison candidate image and as values a CandidateImageDistanceGrid of that candidate image for the current frame
+        output_layout: An OutputLayout of the optimal outputs for the current frame
+        output_image: An OutputImage of the photomosaic for the current frame
+        frame_reports: A list of dicts, one per frame, giving the number of tiles that were recalculated and patched for that frame
+
+    Methods:
+        generate: Generate a photomosaic for each of the target frames
+        output_report_to_csv: Save the values of frame_reports to a csv file
+    """
+
+    def __init__(self, parameters_json_path: str, target_frames: list[str], change_threshold: float = 0.0):
+        """
+        Create a PhotomosaicSequence object.
+
+        :param parameters_json_path: Path to the JSON file containing the parameters. The target_image parameter is only used for the initial parsing, each frame is taken from target_frames.
+        :param target_frames: List of the paths of each target image in the sequence. Each target image must have the same shape.
+        :param change_threshold: The image distance a tile must exceed compared to its previous target to be recalculated
+        """
+        for target_frame in target_frames:
+            if not os.path.isfile(target_frame):
+                raise FileNotFoundError
+        self.parameters_json_path = parameters_json_path
+        self.target_frames = target_frames
+        self.change_threshold = change_threshold
+        self.input_parser = None
+        self.photomosaic_folder = None
+        self.image_distance_grids = {}
+        self.output_layout = None
+        self.output_image = None
+        self.frame_reports = []
+        self._reference_target_image_grid = None
+
+    def generate(self):
+        logging.info('Starting parsing')
+        self.input_parser = InputParser(self.parameters_json_path)
+        self.input_parser.parse()
+        self.photomosaic_folder = self.input_parser.photomosaic_folder
+        os.mkdir(os.path.join(self.photomosaic_folder, 'output_frames'))
+        comparison_candidate_images_folder = os.path.join(self.photomosaic_folder, 'comparison_candidate_images')
+        comparison_candidate_images = {imgname: si.imread(os.path.join(comparison_candidate_images_folder, imgname)) for imgname in os.listdir(comparison_candidate_images_folder)}
+        for frame_number, target_frame in enumerate(self.target_frames):
+            logging.info(f'[Frame {frame_number}] Slicing target image {target_frame}')
+            target_image_grid = self.input_parser.slice_target_image(si.imread(target_frame))
+            if self._reference_target_image_grid is None:
+                changed_mask = np.full(self.input_parser.grid_shape, True)
+                self._reference_target_image_grid = target_image_grid
+            else:
+                changed_mask = self._changed_tiles(target_image_grid)
+                # Tiles below the threshold keep their previous target, so that small changes over several frames still accumulate to a recalculation
+                self._reference_target_image_grid = np.where(changed_mask[:, :, np.newaxis, np.newaxis, np.newaxis], target_image_grid, self._reference_target_image_grid)
+            logging.info(f'[Frame {frame_number}] Recalculating {np.count_nonzero(changed_mask)} tiles')
+            if frame_number == 0:
+                for imgname in sorted(comparison_candidate_images.keys()):
+                    self.image_distance_grids[imgname] = CandidateImageDistanceGrid(comparison_candidate_images[imgname], self._reference_target_image_grid)
+                    self.image_distance_grids[imgname].calculate()
+                self.output_layout = OutputLayout({imgname: grid.distance_grid for (imgname, grid) in self.image_distance_grids.items()})
+                self.output_layout.calculate()
+                self.output_image = OutputImage(self.output_layout.image_grid, os.path.join(self.photomosaic_folder, 'output_candidate_images'))
+                self.output_image.assemble()
+                patched_tiles = changed_mask.size
+            else:
+                for grid in self.image_distance_grids.values():
+                    grid.update(self._reference_target_image_grid, changed_mask)
+                self.output_layout.update({imgname: grid.distance_grid for (imgname, grid) in self.image_distance_grids.items()}, changed_mask)
+                patched_tiles = self.output_image.update(self.output_layout.image_grid)
+            self.output_image.output_to_png(os.path.join(self.photomosaic_folder, 'output_frames', f'frame_{frame_number:05d}.png'))
+            self.frame_reports.append({'frame': frame_number,
+                                       'target_image': target_frame,
+                                       'recalculated_tiles': int(np.count_nonzero(changed_mask)),
+                                       'patched_tiles': patched_tiles,
+                                       'total_tiles': changed_mask.size})
+            logging.info(f'[Frame {frame_number}] Recalculated {self.frame_reports[-1]["recalculated_tiles"]} of {changed_mask.size} tiles, patched {patched_tiles} tiles')
+        self.output_report_to_csv(os.path.join(self.photomosaic_folder, 'frame_report.csv'))
+
+    def output_report_to_csv(self, filepath: str):
+        with open(filepath, 'w', newline='') as opened_csv:
+            writer = csv.DictWriter(opened_csv, fieldnames=['frame', 'target_image', 'recalculated_tiles', 'patched_tiles', 'total_tiles'])
+            writer.writeheader()
+            writer.writerows(self.frame_reports)
+
+    def _changed_tiles(self, target_image_grid: np.ndarray) -> np.ndarray:
+        changed_mask = np.full(self.input_parser.grid_shape, False)
+        for x, y in np.ndindex(self.input_parser.grid_shape):
+            changed_mask[x, y] = image_distance(self._reference_target_image_grid[x, y], target_image_grid[x, y]) > self.change_threshold
+        return changed_mask
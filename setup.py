@@ -10,14 +10,13 @@ setup(
     name="main",
     version="0.1.0",
     description="Python implementation of a main generator",
-    entry_points={'console_scripts': ['main = main.main:main']},
+    entry_points={'console_scripts': ['photomosaic = main.cli:main']},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
         "Programming Language :: Python :: 3",
     ],
-    package_dir={"": "main"},
-    packages=find_packages(where="main"),
-    python_requires=">=3, <4",
-    install_requires=[],
+    packages=find_packages(exclude=["test", "test.*"]),
+    python_requires=">=3.9, <4",
+    install_requires=["numpy", "scikit-image"],
 )
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase, mock
+
+import pytest
+
+from main.cli import main
+from main.exceptions import InvalidImageException
+
+
+class TestCli(TestCase):
+    test_dir = os.path.dirname(__file__)
+    sample_parameters = {'photomosaic_folder': os.path.join(test_dir, 'cli_test'),
+                         'target_image': os.path.join(test_dir, 'resources', '3x4_white_stripe.png'),
+                         'candidate_image_folder': os.path.join(test_dir, 'parse_test_candidates'),
+                         'grid_x': 4,
+                         'grid_y': 3,
+                         'output_x': 8,
+                         'output_y': 6,
+                         'comparison_x': 1,
+                         'comparison_y': 1
+                         }
+
+    def test_lightweight_imports(self):
+        """Test that the entry point and the parameter validation do not import the imaging stack"""
+        statement = 'import sys, main.cli, main.parse; sys.exit("skimage" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', statement], cwd=os.path.dirname(self.test_dir))
+        assert result.returncode == 0
+
+    @mock.patch('os.mkdir')
+    def test_validate_only(self, mocked_mkdir):
+        """Test that validating correct inputs does not create any folders or generate the photomosaic"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            main(['dummy_file_path', '--validate-only'])
+        mocked_json_read.assert_called_once_with('dummy_file_path')
+        mocked_mkdir.assert_not_called()
+
+    def test_validate_only_not_png(self):
+        """Test that if the target image is not a PNG file the appropriate exception is raised"""
+        test_parameters = self.sample_parameters.copy()
+        test_parameters['target_image'] = os.path.join(self.test_dir, '__init__.py')
+        mocked_json_read = mock.Mock(return_value=test_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            with pytest.raises(InvalidImageException):
+                main(['dummy_file_path', '--validate-only'])
+
+    def test_validate_only_missing_frame(self):
+        """Test that if one of the target frames does not exist the appropriate exception is raised"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            with pytest.raises(FileNotFoundError):
+                main(['dummy_file_path', '--validate-only', '--frames', self.sample_parameters['target_image'], os.path.join(self.test_dir, 'does_not_exist.png')])
+
+    def test_validate_only_frame_not_png(self):
+        """Test that if one of the target frames is not a PNG file the appropriate exception is raised"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            with pytest.raises(InvalidImageException):
+                main(['dummy_file_path', '--validate-only', '--frames', os.path.join(self.test_dir, '__init__.py')])
+
+    def test_pyramid_with_frames(self):
+        """Test that asking for a pyramid of a sequence of frames is rejected"""
+        with pytest.raises(SystemExit):
+            main(['dummy_file_path', '--frames', 'frame.png', '--pyramid', '256'])
+
+    def test_invalid_pyramid_tile_size(self):
+        """Test that a pyramid tile size that is not positive is rejected before any work is done, including with --validate-only"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            with pytest.raises(SystemExit):
+                main(['dummy_file_path', '--pyramid', '0'])
+            with pytest.raises(SystemExit):
+                main(['dummy_file_path', '--pyramid', '0', '--validate-only'])
+        mocked_json_read.assert_not_called()
+
+    def test_change_threshold_without_frames(self):
+        """Test that a change threshold without a sequence of frames is rejected"""
+        with pytest.raises(SystemExit):
+            main(['dummy_file_path', '--change-threshold', '5'])
+
+    def test_preview_with_frames(self):
+        """Test that asking for a preview of a sequence of frames is rejected"""
+        with pytest.raises(SystemExit):
+            main(['dummy_file_path', '--frames', 'frame.png', '--preview'])
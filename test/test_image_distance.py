@@ -4,7 +4,7 @@ import pytest
 import os
 import skimage.io as si
 import numpy as np
-from main.image_distance import image_distance, CandidateImageDistanceGrid
+from main.image_distance import image_distance, mean_colour_distance_grid, CandidateImageDistanceGrid
 from main.exceptions import InvalidTypeException, InvalidShapeException
 
 
@@ -86,6 +86,51 @@ class TestCandidateImageDistanceGrid(TestCase):
         assert cd.comparison_shape == (1, 1)
         assert np.array_equal(expected_distances, cd.distance_grid)
 
+    def test_update_distances(self):
+        """Test that updating the target images only recalculates the distances at the changed locations"""
+        cd = CandidateImageDistanceGrid(self.sample_candidate_image, self.sample_target_images)
+        cd.calculate()
+        test_target_images = self.sample_target_images.copy()
+        test_target_images[0, 1] = np.array([[[255, 0, 0]]], dtype=np.uint8)
+        test_target_images[1, 1] = np.array([[[255, 0, 0]]], dtype=np.uint8)
+        # Only the top right location is marked as changed, so the bottom right location keeps its previous distance
+        cd.update(test_target_images, np.array([[False, True], [False, False]]))
+        expected_distances = np.array([[0, 0], [170, 85]])
+        assert np.array_equal(expected_distances, cd.distance_grid)
+
+    def test_update_incorrect_mask_shape(self):
+        """Test that if the mask of changed locations is not the grid shape the appropriate exception is raised"""
+        cd = CandidateImageDistanceGrid(self.sample_candidate_image, self.sample_target_images)
+        cd.calculate()
+        with pytest.raises(InvalidShapeException):
+            cd.update(self.sample_target_images, np.array([[True, True, True], [True, True, True]]))
+
+    def test_mean_colour_distances(self):
+        """Test that the mean colour distances are calculated from the mean colour of each image, and are never more than the image distances"""
+        test_candidate_image = np.array([[[255, 0, 0], [255, 0, 0]]], dtype=np.uint8)
+        test_target_images = np.array([[
+            np.array([[[255, 0, 0], [255, 0, 0]]], dtype=np.uint8),
+            np.array([[[255, 0, 0], [0, 255, 0]]], dtype=np.uint8)
+        ]])
+        # The second target is half red and half green, so its mean colour is (127.5, 127.5, 0) and its mean colour distance is 85
+        expected_distances = np.array([[0, 85]])
+        distances = mean_colour_distance_grid(test_candidate_image, np.mean(test_target_images, axis=(2, 3)))
+        assert np.allclose(expected_distances, distances)
+        cd = CandidateImageDistanceGrid(test_candidate_image, test_target_images)
+        cd.calculate()
+        assert np.all(distances <= cd.distance_grid)
+
+    def test_calculate_pruned(self):
+        """Test that image distances are only calculated where the lower bound is not above the threshold"""
+        lower_bounds = np.array([[0, 100], [50, 50]])
+        thresholds = np.array([[10, 10], [50, 10]])
+        cd = CandidateImageDistanceGrid(self.sample_candidate_image, self.sample_target_images)
+        calculated = cd.calculate_pruned(lower_bounds, thresholds)
+        assert calculated == 2
+        # The locations that are skipped are left as nan
+        expected_distances = np.array([[0, np.nan], [170, np.nan]])
+        assert np.array_equal(expected_distances, cd.distance_grid, equal_nan=True)
+
     def test_different_comparison_target_shapes(self):
         """Test that if the candidate image is a different shape to the target images the appropriate exception is raised"""
         test_candidate_image = np.array([[[255, 0, 0], [255, 0, 0]]], dtype=np.uint8)
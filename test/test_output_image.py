@@ -21,3 +21,16 @@ class TestOutputImage(TestCase):
         oi = OutputImage(self.sample_image_grid, self.sample_image_directory)
         oi.assemble()
         assert np.array_equal(self.sample_expected_image, oi.assembled_image)
+
+    def test_update(self):
+        """Test that updating the grid of chosen images patches the assembled image to match a full assembly"""
+        oi = OutputImage(self.sample_image_grid, self.sample_image_directory)
+        oi.assemble()
+        test_image_grid = self.sample_image_grid.copy()
+        test_image_grid[0, 0] = '3x4_d29c55.png'
+        test_image_grid[3, 2] = '3x4_black_stripe.png'
+        patched_tiles = oi.update(test_image_grid)
+        expected_oi = OutputImage(test_image_grid, self.sample_image_directory)
+        expected_oi.assemble()
+        assert patched_tiles == 2
+        assert np.array_equal(expected_oi.assembled_image, oi.assembled_image)
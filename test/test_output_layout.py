@@ -20,6 +20,25 @@ class TestOutputLayout(TestCase):
         expected_img_grid = np.array([['img1', 'img3'], ['img2', 'img2']])
         assert np.array_equal(expected_img_grid, ol.image_grid)
 
+    def test_update(self):
+        """Test that updating the distances only recalculates the optimal images at the changed locations"""
+        ol = OutputLayout(self.sample_distances)
+        ol.calculate()
+        test_distances = self.sample_distances.copy()
+        test_distances['img3'] = np.array([[50, 5], [0, 0]])
+        ol.update(test_distances, np.array([[False, False], [True, False]]))
+        expected_img_grid = np.array([['img1', 'img3'], ['img3', 'img2']])
+        assert np.array_equal(expected_img_grid, ol.image_grid)
+
+    def test_update_inconsistent_grid_shape(self):
+        """Test that if the updated distances are not the grid shape the appropriate exception is raised"""
+        ol = OutputLayout(self.sample_distances)
+        ol.calculate()
+        test_distances = self.sample_distances.copy()
+        test_distances['img2'] = np.array([[15, 15], [15, 15], [15, 15]])
+        with pytest.raises(InvalidShapeException):
+            ol.update(test_distances, np.array([[True, True], [True, True]]))
+
     def test_inconsistent_grid_shape(self):
         """Test that if the grid shapes are not all the same shape the appropriate exception is raised"""
         test_distances = self.sample_distances.copy()
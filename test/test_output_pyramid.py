@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pytest
+import skimage.io as si
+from main.exceptions import InvalidShapeException
+from main.output_pyramid import OutputPyramid
+
+
+def _read_images(image_directory):
+    return {image_name: si.imread(os.path.join(image_directory, image_name)) for image_name in os.listdir(image_directory)}
+
+
+class TestOutputPyramid(TestCase):
+    test_dir = os.path.dirname(__file__)
+    sample_image_grid = np.array([['3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png'],
+                                  ['3x4_black_stripe.png', '3x4_black_stripe.png', '3x4_black_stripe.png', '3x4_black_stripe.png'],
+                                  ['3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png'],
+                                  ['3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png', '3x4_white_stripe.png'],
+                                  ])
+    sample_image_directory = os.path.join(test_dir, 'resources')
+    sample_candidate_images = _read_images(sample_image_directory)
+    sample_expected_image = si.imread(os.path.join(sample_image_directory, '12x16_stripes.png'))
+
+    def test_levels(self):
+        """Test that the pyramid halves in size at each level down to a single pixel"""
+        op = OutputPyramid(self.sample_image_grid, self.sample_candidate_images, tile_size=8)
+        assert op.full_shape == (16, 12)
+        assert op.levels == 5
+        assert [op.level_shape(level) for level in range(op.levels)] == [(1, 1), (2, 2), (4, 3), (8, 6), (16, 12)]
+
+    def test_full_size_tiles(self):
+        """Test that the tiles of the last level together give the fully assembled image"""
+        op = OutputPyramid(self.sample_image_grid, self.sample_candidate_images, tile_size=8)
+        tiles = [[op.assemble_tile(op.levels - 1, tile_x, tile_y) for tile_y in range(2)] for tile_x in range(2)]
+        assert tiles[0][1].shape == (8, 4, 3)
+        assert np.array_equal(self.sample_expected_image, np.vstack([np.hstack(row) for row in tiles]))
+
+    def test_reduced_tiles(self):
+        """Test that the tiles of a smaller level are assembled from resized candidate images"""
+        op = OutputPyramid(self.sample_image_grid, self.sample_candidate_images, tile_size=8)
+        tile = op.assemble_tile(op.levels - 2, 0, 0)
+        assert tile.shape == (8, 6, 3)
+        # Each row of the grid is two pixels high at this level, and every candidate image in a row of the grid is the same
+        expected_rows = [op._thumbnail(row[0], (2, 2))[:, 0] for row in self.sample_image_grid]
+        assert np.array_equal(tile[:, 0], np.vstack(expected_rows))
+
+    def test_output_to_deep_zoom(self):
+        """Test that every tile of every level is saved in the Deep Zoom layout"""
+        working_dir = tempfile.mkdtemp()
+        try:
+            op = OutputPyramid(self.sample_image_grid, self.sample_candidate_images, tile_size=8)
+            op.output_to_deep_zoom(os.path.join(working_dir, 'pyramid'), max_workers=2)
+            assert os.path.isfile(os.path.join(working_dir, 'pyramid', 'mosaic.dzi'))
+            tiles_dir = os.path.join(working_dir, 'pyramid', 'mosaic_files')
+            assert sorted(os.listdir(os.path.join(tiles_dir, '4'))) == ['0_0.png', '0_1.png', '1_0.png', '1_1.png']
+            assert sorted(os.listdir(os.path.join(tiles_dir, '0'))) == ['0_0.png']
+            assert np.array_equal(si.imread(os.path.join(tiles_dir, '4', '1_0.png')), self.sample_expected_image[:8, 8:])
+        finally:
+            shutil.rmtree(working_dir)
+
+    def test_inconsistent_candidate_shapes(self):
+        """Test that if the candidate images are not all the same shape the appropriate exception is raised"""
+        test_image_grid = self.sample_image_grid.copy()
+        test_image_grid[0, 0] = '4x3_000000.png'
+        with pytest.raises(InvalidShapeException):
+            OutputPyramid(test_image_grid, self.sample_candidate_images)
+
+    def test_invalid_tile_size(self):
+        """Test that if the tile size is not a positive integer the appropriate exception is raised"""
+        with pytest.raises(InvalidShapeException):
+            OutputPyramid(self.sample_image_grid, self.sample_candidate_images, tile_size=0)
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+import pytest
+
+from main.exceptions import InvalidShapeException
+from main.photomosaic import Photomosaic
+
+
+class TestPhotomosaic(TestCase):
+    test_dir = os.path.dirname(__file__)
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.sample_parameters = {'photomosaic_folder': os.path.join(self.working_dir, 'photomosaic_test'),
+                                  'target_image': os.path.join(self.test_dir, 'resources', '3x4_white_stripe.png'),
+                                  'candidate_image_folder': os.path.join(self.test_dir, 'parse_test_candidates'),
+                                  'grid_x': 4,
+                                  'grid_y': 3,
+                                  'output_x': 2,
+                                  'output_y': 2,
+                                  'comparison_x': 1,
+                                  'comparison_y': 1
+                                  }
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def test_generate_pyramid(self):
+        """Test that generating a pyramid saves the final photomosaic as tiles instead of saving an output image at each iteration"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            pm = Photomosaic('dummy_file_path', pyramid_tile_size=4)
+            pm.generate()
+        photomosaic_folder = self.sample_parameters['photomosaic_folder']
+        assert os.listdir(os.path.join(photomosaic_folder, 'output_images')) == []
+        assert os.path.isfile(os.path.join(photomosaic_folder, 'output_pyramid', 'mosaic.dzi'))
+        # The full photomosaic is 8x6, so the last level has 2x2 tiles of size 4
+        top_level = str(pm.output_pyramid.levels - 1)
+        assert sorted(os.listdir(os.path.join(photomosaic_folder, 'output_pyramid', 'mosaic_files', top_level))) == ['0_0.png', '0_1.png', '1_0.png', '1_1.png']
+        # The pyramid is made from the output layout after the last candidate image
+        assert (pm.output_pyramid._image_grid == pm.output_layouts['3x4_ffffff.png'].image_grid).all()
+
+    def test_invalid_pyramid_tile_size(self):
+        """Test that if the pyramid tile size is not positive the appropriate exception is raised before parsing starts"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            with pytest.raises(InvalidShapeException):
+                Photomosaic('dummy_file_path', pyramid_tile_size=0)
+        mocked_json_read.assert_not_called()
+
+    def test_generate_preview(self):
+        """Test that generating a preview first gives the same final photomosaic as generating it without a preview"""
+        plain_parameters = self.sample_parameters.copy()
+        plain_parameters['photomosaic_folder'] = os.path.join(self.working_dir, 'plain_test')
+        with mock.patch('main.parse._read_json', mock.Mock(return_value=plain_parameters)):
+            plain_pm = Photomosaic('dummy_file_path')
+            plain_pm.generate()
+        with mock.patch('main.parse._read_json', mock.Mock(return_value=self.sample_parameters)):
+            preview_pm = Photomosaic('dummy_file_path', preview=True)
+            with self.assertLogs(level='INFO') as logs:
+                preview_pm.generate()
+        photomosaic_folder = self.sample_parameters['photomosaic_folder']
+        assert sorted(os.listdir(os.path.join(photomosaic_folder, 'preview'))) == ['preview.png', 'preview_layout.csv']
+        # Only the output layout and output image of the last candidate image are saved, as the earlier ones would not be optimal
+        assert list(preview_pm.output_layouts.keys()) == ['3x4_ffffff.png']
+        assert os.listdir(os.path.join(photomosaic_folder, 'output_layouts')) == ['3x4_ffffff.png.csv']
+        assert os.listdir(os.path.join(photomosaic_folder, 'output_images')) == ['3x4_ffffff.png']
+        assert np.array_equal(plain_pm.output_layouts['3x4_ffffff.png'].image_grid, preview_pm.output_layouts['3x4_ffffff.png'].image_grid)
+        assert np.array_equal(plain_pm.output_images['3x4_ffffff.png'].assembled_image, preview_pm.output_images['3x4_ffffff.png'].assembled_image)
+        # Each target tile is plain black or white, so the mean colour of the other candidate image rules it out everywhere
+        assert set(preview_pm.timings.keys()) == {'preview', 'distances', 'full', 'skipped_distances'}
+        assert set(plain_pm.timings.keys()) == {'distances', 'full'}
+        assert any('12 of 24 image distances calculated' in message for message in logs.output)
+        assert any('skipped 12 image distances' in message for message in logs.output)
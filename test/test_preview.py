@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import numpy as np
+import pytest
+from main.exceptions import InvalidShapeException
+from main.image_distance import CandidateImageDistanceGrid
+from main.output_layout import OutputLayout
+from main.preview import PhotomosaicPreview
+
+
+class TestPhotomosaicPreview(TestCase):
+    # The candidates are plain red, plain green and a red and green checkerboard, which has the same mean colour as a plain dark yellow
+    sample_candidate_images = {
+        'red.png': np.array([[[255, 0, 0], [255, 0, 0]], [[255, 0, 0], [255, 0, 0]]], dtype=np.uint8),
+        'green.png': np.array([[[0, 255, 0], [0, 255, 0]], [[0, 255, 0], [0, 255, 0]]], dtype=np.uint8),
+        'checkerboard.png': np.array([[[255, 0, 0], [0, 255, 0]], [[0, 255, 0], [255, 0, 0]]], dtype=np.uint8),
+    }
+    sample_target_images = np.array([[
+        np.array([[[255, 0, 0], [255, 0, 0]], [[255, 0, 0], [255, 0, 0]]], dtype=np.uint8),
+        np.array([[[128, 128, 0], [128, 128, 0]], [[128, 128, 0], [128, 128, 0]]], dtype=np.uint8),
+    ]])
+
+    def test_calculate(self):
+        """Test that the preview chooses the images by mean colour, and gives the image distance of its choices"""
+        pp = PhotomosaicPreview(self.sample_candidate_images, self.sample_target_images)
+        pp.calculate()
+        expected_img_grid = np.array([['red.png', 'checkerboard.png']])
+        assert np.array_equal(expected_img_grid, pp.output_layout.image_grid)
+        # The checkerboard is 127 or 128 away from the dark yellow in two channels of every pixel
+        assert np.allclose(pp.best_distances, np.array([[0, 255 / 3]]), atol=0.5)
+
+    def test_pruned_layout_matches_full_layout(self):
+        """Test that pruning with the preview gives the same output layout as calculating every image distance"""
+        random_state = np.random.RandomState(0)
+        # Each image is a random plain colour with a small amount of noise, so that the mean colours are distinct
+        candidate_images = {f'{i}.png': (random_state.randint(0, 224, (1, 1, 3)) + random_state.randint(0, 32, (3, 3, 3))).astype(np.uint8) for i in range(20)}
+        target_images = (random_state.randint(0, 224, (5, 4, 1, 1, 3)) + random_state.randint(0, 32, (5, 4, 3, 3, 3))).astype(np.uint8)
+        pp = PhotomosaicPreview(candidate_images, target_images)
+        pp.calculate()
+        full_distances = {}
+        pruned_distances = {}
+        calculated = 0
+        for (imgname, candidate_image) in candidate_images.items():
+            full_grid = CandidateImageDistanceGrid(candidate_image, target_images)
+            full_grid.calculate()
+            full_distances[imgname] = full_grid.distance_grid
+            pruned_grid = CandidateImageDistanceGrid(candidate_image, target_images)
+            calculated += pruned_grid.calculate_pruned(pp.lower_bound_grids[imgname], pp.best_distances)
+            pruned_distances[imgname] = pruned_grid.distance_grid
+        full_layout = OutputLayout(full_distances)
+        full_layout.calculate()
+        pruned_layout = OutputLayout(pruned_distances)
+        pruned_layout.calculate()
+        assert np.array_equal(full_layout.image_grid, pruned_layout.image_grid)
+        assert calculated < 20 * 5 * 4
+
+    def test_incorrect_target_shape(self):
+        """Test that if the target images are not a grid of images the appropriate exception is raised"""
+        with pytest.raises(InvalidShapeException):
+            PhotomosaicPreview(self.sample_candidate_images, self.sample_target_images[0])
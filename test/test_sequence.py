@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+import skimage.io as si
+
+from main.sequence import PhotomosaicSequence
+
+
+class TestPhotomosaicSequence(TestCase):
+    test_dir = os.path.dirname(__file__)
+    sample_frames = [os.path.join(test_dir, 'resources', '3x4_white_stripe.png'),
+                     os.path.join(test_dir, 'resources', '3x4_000000.png'),
+                     os.path.join(test_dir, 'resources', '3x4_000000.png')]
+
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+        self.sample_parameters = {'photomosaic_folder': os.path.join(self.working_dir, 'sequence_test'),
+                                  'target_image': self.sample_frames[0],
+                                  'candidate_image_folder': os.path.join(self.test_dir, 'parse_test_candidates'),
+                                  'grid_x': 4,
+                                  'grid_y': 3,
+                                  'output_x': 2,
+                                  'output_y': 2,
+                                  'comparison_x': 1,
+                                  'comparison_y': 1
+                                  }
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def test_generate(self):
+        """Test that each frame is output, and only the tiles that changed between frames are recalculated"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            ps = PhotomosaicSequence('dummy_file_path', self.sample_frames)
+            ps.generate()
+        # The first frame is calculated in full, the second frame only differs in the white stripe, and the third frame is identical to the second
+        assert [report['recalculated_tiles'] for report in ps.frame_reports] == [12, 3, 0]
+        assert [report['patched_tiles'] for report in ps.frame_reports] == [12, 3, 0]
+        frames_folder = os.path.join(self.sample_parameters['photomosaic_folder'], 'output_frames')
+        assert sorted(os.listdir(frames_folder)) == ['frame_00000.png', 'frame_00001.png', 'frame_00002.png']
+        assert np.array_equal(si.imread(os.path.join(frames_folder, 'frame_00002.png')), np.zeros((8, 6, 3), dtype=np.uint8))
+        assert os.path.isfile(os.path.join(self.sample_parameters['photomosaic_folder'], 'frame_report.csv'))
+
+    def test_change_threshold(self):
+        """Test that tiles whose change is within the threshold are not recalculated"""
+        mocked_json_read = mock.Mock(return_value=self.sample_parameters)
+        with mock.patch('main.parse._read_json', mocked_json_read):
+            ps = PhotomosaicSequence('dummy_file_path', self.sample_frames, change_threshold=255)
+            ps.generate()
+        assert [report['recalculated_tiles'] for report in ps.frame_reports] == [12, 0, 0]
+
+    def test_missing_frame(self):
+        """Test that if a target frame does not exist the appropriate exception is raised"""
+        with self.assertRaises(FileNotFoundError):
+            PhotomosaicSequence('dummy_file_path', [os.path.join(self.test_dir, 'does_not_exist.png')])